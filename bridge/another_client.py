@@ -1,53 +1,367 @@
-from typing import List, Optional
-import base64
+from __future__ import annotations
+
+import collections
+from collections.abc import Iterable
+import binascii
+import functools
+import hashlib
+import json
+import logging
+import time
+import weakref
+from contextlib import AsyncExitStack
 from datetime import timedelta
+import httpx
+import orjson
 from mcp import ClientSession
 from mcp.types import Tool as MCPTool
 from mcp.types import CallToolResult as MCPCallToolResult
 from mcp.types import CallToolRequestParams as MCPCallToolRequestParams
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.client.websocket import websocket_client
 
 from mcp_types import MCPAuth, MCPTransport, MCPTransportType, MCPAuthType
+from mcp_runtime import run
 
+import anyio
 import asyncio
 import click
 
+logger = logging.getLogger(__name__)
+
 # default dummy token
 token = "sk-1234"
 
+# (header name, value template) for each auth type that sends a header
+_AUTH_HEADER_FORMATS: dict[str, tuple[str, str]] = {
+    MCPAuth.bearer_token: ("Authorization", "Bearer %s"),
+    MCPAuth.basic: ("Authorization", "Basic %s"),
+    MCPAuth.api_key: ("X-API-Key", "%s"),
+}
+
+# how long a full SSE buffer may block the reader before it is reported
+SSE_STALL_WARNING_SECONDS = 1.0
 
+
+@functools.lru_cache(maxsize=256)
 def to_basic_auth(auth_value: str) -> str:
     """Convert auth value to Basic Auth format."""
-    return base64.b64encode(auth_value.encode("utf-8")).decode()
+    return binascii.b2a_base64(auth_value.encode("utf-8"), newline=False).decode(
+        "ascii"
+    )
+
+
+def _auth_fingerprint(auth_value: str | None) -> str:
+    """
+    Short, non-reversible fingerprint of an auth value.
+      Used to scope caches and pooled sessions per principal without keeping the
+      raw credential in any key. Not a security token.
+    """
+    if not auth_value:
+        return ""
+    return hashlib.blake2b(auth_value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _call_cache_key(auth_fingerprint: str, name: str, arguments: dict | None) -> str:
+    """Build a stable cache key for a tool call from its caller, name and arguments."""
+    try:
+        canonical = orjson.dumps(
+            arguments,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+    except orjson.JSONEncodeError:
+        # e.g. ints wider than 64 bits, which only the stdlib encoder handles
+        canonical = json.dumps(arguments, default=str, sort_keys=True).encode()
+    digest = hashlib.sha256(canonical).hexdigest()
+    return auth_fingerprint + ":" + name + ":" + digest
+
+
+async def _pump_sse(read_stream, send_stream, server_url: str):
+    """
+    Forward messages from an SSE transport into a bounded stream.
+      When the buffer is full the pump stops reading from the transport, which
+      pushes back on the server through TCP flow control.
+    """
+    loop = asyncio.get_running_loop()
+    async with send_stream:
+        try:
+            async for message in read_stream:
+                try:
+                    send_stream.send_nowait(message)
+                    continue
+                except anyio.WouldBlock:
+                    pass
+                # the buffer is full: warn while still blocked, so a consumer that
+                # never catches up is reported too. A timer rather than a cancelled
+                # send, since a send cancelled as it completes would be re-sent.
+                warning = loop.call_later(
+                    SSE_STALL_WARNING_SECONDS,
+                    logger.warning,
+                    "SSE consumer for %s stalled for over %.1fs with a full buffer",
+                    server_url,
+                    SSE_STALL_WARNING_SECONDS,
+                )
+                try:
+                    await send_stream.send(message)
+                finally:
+                    warning.cancel()
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+            # the session stopped reading
+            pass
+
+
+# (server_url, transport, auth_type, auth fingerprint, timeout, http2,
+# keepalive_expiry, sse_queue_size): clients only share a session when every
+# setting the transport was opened with matches
+_PoolKey = tuple[str, str, str, str, float, bool, float, int]
+
+
+class _PooledSession:
+    """
+    Transport + initialized ClientSession shared by every MCPClient that points
+    at the same server with the same credentials.
+      The transport is entered and exited from a dedicated task, since anyio
+      cancel scopes must be exited by the task that entered them.
+    """
+
+    __slots__ = (
+        "session",
+        "refcount",
+        "_ready",
+        "_opened",
+        "_closing",
+        "_task",
+    )
+
+    def __init__(self):
+        # only set once initialize() succeeded, and cleared when the transport exits
+        self.session: ClientSession | None = None
+        self.refcount: int = 0
+        self._ready = asyncio.Event()
+        # whether initialize() ever succeeded; open errors go to the caller instead
+        self._opened: bool = False
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(
+        self, client: MCPClient, sessions: dict[_PoolKey, _PooledSession], key: _PoolKey
+    ):
+        """Start opening the transport and session for the given client's settings."""
+        self._task = asyncio.create_task(self._hold(client, sessions, key))
+        self._task.add_done_callback(
+            functools.partial(self._log_exit, client.server_url)
+        )
+
+    async def wait_ready(self):
+        """Wait for the session to be initialized, raising the error if setup failed."""
+        await self._ready.wait()
+        if self.session is None:
+            # _hold has already unwound; surface whatever it failed with
+            await self._task
+            raise ConnectionError("MCP session closed before it was initialized")
+
+    async def close(self):
+        """Tear down the session and transport."""
+        self._closing.set()
+        if self._task:
+            # the error, if any, was already logged by _log_exit
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def _log_exit(self, server_url: str, task: asyncio.Task):
+        # retrieve the outcome so a dead transport never logs
+        # "Task exception was never retrieved"
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None and self._opened and not self._closing.is_set():
+            logger.warning("MCP session to %s exited with error: %r", server_url, error)
+
+    async def _hold(
+        self, client: MCPClient, sessions: dict[_PoolKey, _PooledSession], key: _PoolKey
+    ):
+        # everything entered on the stack unwinds in reverse order, including
+        # whatever was already open when setup fails part way through
+        try:
+            async with AsyncExitStack() as stack:
+                transport = await stack.enter_async_context(_transport_context(client))
+                read_stream, write_stream = transport[0], transport[1]
+                if client.transport_type == MCPTransport.sse:
+                    send_stream, read_stream = anyio.create_memory_object_stream(
+                        client.sse_queue_size
+                    )
+                    pump = asyncio.create_task(
+                        _pump_sse(transport[0], send_stream, client.server_url)
+                    )
+                    stack.push_async_callback(_cancel_task, pump)
+                session = await stack.enter_async_context(
+                    ClientSession(read_stream, write_stream)
+                )
+                await session.initialize()
+                self.session = session
+                self._opened = True
+                self._ready.set()
+
+                # also unwinds when the loop shuts down and cancels this task
+                await self._closing.wait()
+        finally:
+            self.session = None
+            # a transport that failed or died is never handed out again
+            if sessions.get(key) is self:
+                del sessions[key]
+            self._ready.set()
+
+
+def _transport_context(client: MCPClient):
+    """Build the transport context manager for the client's transport type."""
+    headers = client._auth_headers
+
+    if client.transport_type == MCPTransport.sse:
+        return sse_client(
+            url=client.server_url,
+            timeout=client.timeout,
+            headers=headers,
+            httpx_client_factory=client._http_client_factory,
+        )
+    if client.transport_type == MCPTransport.ws:
+        # the mcp websocket client cannot send custom handshake headers
+        if headers:
+            raise ValueError("Auth headers are not supported over the ws transport")
+        return websocket_client(url=client.server_url)
+    return streamablehttp_client(
+        url=client.server_url,
+        timeout=timedelta(seconds=client.timeout),
+        headers=headers,
+        httpx_client_factory=client._http_client_factory,
+    )
+
+
+async def _cancel_task(task: asyncio.Task):
+    """Cancel a task and wait for it to finish."""
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+class _LoopPool:
+    """
+    Pooled sessions for one event loop.
+      Sessions keyed by _PoolKey. An entry is added as soon as its session starts
+      opening, so concurrent clients for the same key wait on that one open.
+    """
+
+    __slots__ = ("sessions",)
+
+    def __init__(self):
+        # only touched between awaits, so the loop itself serializes access
+        self.sessions: dict[_PoolKey, _PooledSession] = {}
+
+
+# transports and locks are bound to the loop that created them, so every loop
+# gets its own pool
+_LOOP_POOLS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPool] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_pool() -> _LoopPool:
+    """Return the session pool for the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _LOOP_POOLS.get(loop)
+    if pool is None:
+        # drop pools left behind by loops that closed without shutdown_pool()
+        for stale_loop in [l for l in _LOOP_POOLS if l.is_closed()]:
+            del _LOOP_POOLS[stale_loop]
+        pool = _LOOP_POOLS[loop] = _LoopPool()
+    return pool
+
+
+async def shutdown_pool():
+    """Close every pooled session on the running loop, regardless of references."""
+    pool = _loop_pool()
+    pooled_sessions = list(pool.sessions.values())
+    pool.sessions.clear()
+    # each session tears down in its own task, so they can close concurrently
+    await asyncio.gather(
+        *(pooled.close() for pooled in pooled_sessions), return_exceptions=True
+    )
 
 
 class MCPClient:
     """
     MCP Client supporting:
-      SSE and HTTP transports
+      SSE, HTTP and WebSocket transports
       Authentication via Bearer token, Basic Auth, or API Key
       Tool calling with error handling and result parsing
     """
 
+    __slots__ = (
+        "server_url",
+        "transport_type",
+        "auth_type",
+        "timeout",
+        "keepalive_expiry",
+        "http2",
+        "sse_queue_size",
+        "_mcp_auth_value",
+        "_auth_headers",
+        "_auth_fingerprint",
+        "_connections",
+        "_tools_cache",
+        "_tools_ttl",
+        "_memoizable_tools",
+        "_call_cache",
+        "_call_locks",
+        "_call_cache_ttl",
+        "_call_cache_size",
+    )
+
     def __init__(
         self,
         server_url: str,
         transport_type: MCPTransportType = MCPTransport.http,
         auth_type: MCPAuthType = None,
-        auth_value: Optional[str] = None,
+        auth_value: str | None = None,
         timeout: float = 60.0,
+        tools_ttl: float = 30.0,
+        idempotent_tools: Iterable[str] | None = None,
+        call_cache_ttl: float = 30.0,
+        call_cache_size: int = 256,
+        keepalive_expiry: float = 300.0,
+        http2: bool = True,
+        sse_queue_size: int = 1024,
     ):
         self.server_url: str = server_url
         self.transport_type: MCPTransport = transport_type
         self.auth_type: MCPAuthType = auth_type
         self.timeout: float = timeout
-        self._mcp_auth_value: Optional[str] = None
-        self._session: Optional[ClientSession] = None
-        self._context = None
-        self._transport_ctx = None
-        self._transport = None
-        self._session_ctx = None
+        # how long idle pooled connections are kept before being dropped
+        self.keepalive_expiry: float = keepalive_expiry
+        # negotiated via ALPN, so plain http:// servers still get HTTP/1.1
+        self.http2: bool = http2
+        # max messages buffered from an SSE stream before reads stop
+        self.sse_queue_size: int = sse_queue_size
+        self._mcp_auth_value: str | None = None
+        # built once per auth value and shared by every connect; do not mutate
+        self._auth_headers: dict[str, str] = {}
+        self._auth_fingerprint: str = ""
+        # (pool key, pooled session) for each event loop this client is attached on
+        self._connections: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[_PoolKey, _PooledSession]
+        ] = weakref.WeakKeyDictionary()
+        # (auth_fingerprint, cached_at, tools) from the last list_tools call
+        self._tools_cache: tuple[str, float, list[MCPTool]] | None = None
+        self._tools_ttl: float = tools_ttl
+        # memoized results for tools that are safe to replay, keyed by _call_cache_key;
+        # least recently used results are evicted past call_cache_size
+        self._memoizable_tools: set[str] = set(idempotent_tools or ())
+        self._call_cache: collections.OrderedDict[
+            str, tuple[float, MCPCallToolResult]
+        ] = collections.OrderedDict()
+        # only held while a call for the key is in flight
+        self._call_locks: dict[str, asyncio.Lock] = {}
+        self._call_cache_ttl: float = call_cache_ttl
+        self._call_cache_size: int = call_cache_size
 
         # handle the basic auth value if provided
         if auth_value:
@@ -58,52 +372,83 @@ class MCPClient:
         Enable async context manager support.
           Initializes the transport and session.
         """
-        headers = self._get_auth_headers()
-
-        if self.transport_type == MCPTransport.sse:
-            self._transport_ctx = sse_client(
-                url=self.server_url,
-                timeout=self.timeout,
-                headers=headers,
-            )
-            self._transport = await self._transport_ctx.__aenter__()
-            self._session_ctx = ClientSession(self._transport[0], self._transport[1])
-            self._session = await self._session_ctx.__aenter__()
-            await self._session.initialize()
-        else:
-            self._transport_ctx = streamablehttp_client(
-                url=self.server_url,
-                timeout=timedelta(seconds=self.timeout),
-                headers=headers,
-            )
-            self._transport = await self._transport_ctx.__aenter__()
-            self._session_ctx = ClientSession(self._transport[0], self._transport[1])
-            self._session = await self._session_ctx.__aenter__()
-            await self._session.initialize()
+        await self.connect()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Cleanup when exiting context manager."""
-        if self._session:
-            await self._session_ctx.__aexit__(exc_type, exc_val, exc_tb)
-        if self._transport_ctx:
-            await self._transport_ctx.__aexit__(exc_type, exc_val, exc_tb)
+        await self.disconnect()
+
+    async def connect(self):
+        """
+        Attach to the pooled session for this server, opening it if needed.
+          Clients sharing server_url, transport, credentials and transport settings
+          share one session.
+        """
+        loop = asyncio.get_running_loop()
+        connection = self._connections.get(loop)
+        if connection is not None:
+            if connection[1].session is not None:
+                return
+            # the pooled transport died since we attached; drop it and reopen
+            await self._release(loop)
+        # locks from a previous loop cannot be awaited on this one
+        self._call_locks.clear()
+
+        key = (
+            self.server_url,
+            MCPTransport(self.transport_type).value,
+            self.auth_type or "",
+            self._auth_fingerprint,
+            self.timeout,
+            self.http2,
+            self.keepalive_expiry,
+            self.sse_queue_size,
+        )
+        pool = _loop_pool()
+        pooled = pool.sessions.get(key)
+        if pooled is None:
+            logger.debug("Opening %s session to %s", key[1], self.server_url)
+            pooled = pool.sessions[key] = _PooledSession()
+            pooled.start(self, pool.sessions, key)
+        pooled.refcount += 1
+        self._connections[loop] = (key, pooled)
+        # wait outside any pool-wide lock, so a slow server only holds up the
+        # clients opening that same session
+        try:
+            await pooled.wait_ready()
+        except BaseException:
+            await self._release(loop)
+            raise
+        logger.debug(
+            "Attached to %s session (refs=%d)", self.server_url, pooled.refcount
+        )
 
     async def disconnect(self):
-        """Clean up session and connections."""
-        if self._session:
-            try:
-                await self._session.close()  # Ensure session is properly closed
-            except Exception:
-                pass
-            self._session = None
-
-        if self._context:
-            try:
-                await self._context.__aexit__(None, None, None)
-            except Exception:
-                pass
-            self._context = None
+        """
+        Release the pooled session.
+          The transport is only torn down once no client references it.
+        """
+        self.invalidate_tools()
+        self._call_cache.clear()
+        self._call_locks.clear()
+        await self._release(asyncio.get_running_loop())
+
+    async def _release(self, loop: asyncio.AbstractEventLoop):
+        """Drop this client's reference to its pooled session on the given loop."""
+        connection = self._connections.pop(loop, None)
+        if connection is None:
+            return
+
+        key, pooled = connection
+        pooled.refcount -= 1
+        if pooled.refcount > 0:
+            return
+        pool = _loop_pool()
+        if pool.sessions.get(key) is pooled:
+            del pool.sessions[key]
+        logger.debug("Closing %s session to %s", key[1], self.server_url)
+        await pooled.close()
 
     def update_auth_value(self, mcp_auth_value: str):
         """
@@ -113,51 +458,142 @@ class MCPClient:
             # Assuming mcp_auth_value is in format "username:password", convert it when updating
             mcp_auth_value = to_basic_auth(mcp_auth_value)
         self._mcp_auth_value = mcp_auth_value
+        self._auth_headers = self._build_auth_headers()
+        self._auth_fingerprint = _auth_fingerprint(mcp_auth_value)
 
-    def _get_auth_headers(self) -> dict:
+    def _build_auth_headers(self) -> dict:
         """Generate authentication headers based on auth type."""
-        if not self._mcp_auth_value:
+        header_format = _AUTH_HEADER_FORMATS.get(self.auth_type)
+        if not self._mcp_auth_value or header_format is None:
             return {}
 
-        if self.auth_type == MCPAuth.bearer_token:
-            return {"Authorization": f"Bearer {self._mcp_auth_value}"}
-        elif self.auth_type == MCPAuth.basic:
-            return {"Authorization": f"Basic {self._mcp_auth_value}"}
-        elif self.auth_type == MCPAuth.api_key:
-            return {"X-API-Key": self._mcp_auth_value}
-        return {}
+        header_name, value_template = header_format
+        return {header_name: value_template % self._mcp_auth_value}
 
-    async def list_tools(self) -> List[MCPTool]:
-        """List available tools from the server."""
+    def _http_client_factory(
+        self,
+        headers: dict[str, str] | None = None,
+        timeout: httpx.Timeout | None = None,
+        auth: httpx.Auth | None = None,
+    ) -> httpx.AsyncClient:
+        """
+        httpx client factory for the MCP transports.
+          Same defaults as mcp's create_mcp_http_client, with an explicit keep-alive
+          pool so idle connections survive gaps between list_tools/call_tool, and
+          HTTP/2 so concurrent calls multiplex over one connection.
+        """
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            http2=self.http2,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.Timeout(30.0),
+            auth=auth,
+            limits=httpx.Limits(
+                max_keepalive_connections=10,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+
+    @property
+    def _session(self) -> ClientSession | None:
+        """Session this client is attached to on the running event loop."""
+        connection = self._connections.get(asyncio.get_running_loop())
+        return connection[1].session if connection else None
+
+    def invalidate_tools(self):
+        """Drop the cached tool list so the next list_tools call hits the server."""
+        self._tools_cache = None
+
+    async def list_tools(self) -> list[MCPTool]:
+        """
+        List available tools from the server.
+          Results are cached for `tools_ttl` seconds per session.
+        """
         if not self._session:
             await self.connect()
 
-        result = await self._session.list_tools()
-        if hasattr(result, "tools") and result.tools:
-            return result.tools
-        return result
+        if self._tools_cache is not None:
+            auth_fingerprint, cached_at, tools = self._tools_cache
+            if (
+                auth_fingerprint == self._auth_fingerprint
+                and time.monotonic() - cached_at < self._tools_ttl
+            ):
+                return tools
+
+        # ClientSession.list_tools always returns a ListToolsResult
+        tools = (await self._session.list_tools()).tools
+        self._tools_cache = (self._auth_fingerprint, time.monotonic(), tools)
+
+        # tools the server marks as idempotent and read-only are safe to memoize
+        for tool in tools:
+            annotations = tool.annotations
+            if annotations and annotations.idempotentHint and annotations.readOnlyHint:
+                self._memoizable_tools.add(tool.name)
+        return tools
 
     async def call_tool(
         self, call_tool_request_params: MCPCallToolRequestParams
     ) -> MCPCallToolResult:
         """
         Call an MCP Tool.
+          Idempotent tools are memoized on (name, arguments) for `call_cache_ttl` seconds.
         """
         if not self._session:
             await self.connect()
 
-        tool_result = await self._session.call_tool(
-            name=call_tool_request_params.name,
-            arguments=call_tool_request_params.arguments,
-        )
+        name = call_tool_request_params.name
+        arguments = call_tool_request_params.arguments
+        if name not in self._memoizable_tools:
+            return await self._session.call_tool(name=name, arguments=arguments)
+
+        key = _call_cache_key(self._auth_fingerprint, name, arguments)
+        # concurrent callers with the same key wait for the first one instead of
+        # all hitting the server
+        lock = self._call_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self._call_cache.get(key)
+                if cached is not None:
+                    cached_at, tool_result = cached
+                    if time.monotonic() - cached_at < self._call_cache_ttl:
+                        self._call_cache.move_to_end(key)
+                        return tool_result
+                    del self._call_cache[key]
+
+                tool_result = await self._session.call_tool(
+                    name=name, arguments=arguments
+                )
+                # never replay a failure
+                if not tool_result.isError:
+                    self._call_cache[key] = (time.monotonic(), tool_result)
+                    if len(self._call_cache) > self._call_cache_size:
+                        self._call_cache.popitem(last=False)
+        finally:
+            # waiters already queued on the lock still see the cached result
+            if not lock.locked() and self._call_locks.get(key) is lock:
+                del self._call_locks[key]
         return tool_result
 
+    async def call_tools_batch(
+        self, call_tool_request_params_list: list[MCPCallToolRequestParams]
+    ) -> list[MCPCallToolResult]:
+        """
+        Call several MCP Tools concurrently over the same session.
+          Results are returned in the same order as the requests.
+        """
+        if not self._session:
+            await self.connect()
+
+        return await asyncio.gather(
+            *(self.call_tool(params) for params in call_tool_request_params_list)
+        )
+
 
 async def test(
     url: str,
     transport: MCPTransportType,
     auth_type: MCPAuthType,
-    auth_value: Optional[str] = None,
+    auth_value: str | None = None,
 ):
     """Test the MCP client connection and tool listing."""
     async with MCPClient(
@@ -165,21 +601,17 @@ async def test(
     ) as client:
         tools = await client.list_tools()
         print("Available tools:")
-        if hasattr(tools, "tools"):
-            for tool in tools.tools:
-                print(f" - {tool.name}: {tool.description}")
-        else:
-            for tool in tools:
-                print(f" - {tool.name}: {tool.description}")
+        for tool in tools:
+            print(f" - {tool.name}: {tool.description}")
 
 
 @click.command()
 @click.option(
     "--transport",
     "-t",
-    type=click.Choice(["http", "sse"], case_sensitive=False),
+    type=click.Choice(["http", "sse", "ws"], case_sensitive=False),
     default="http",
-    help="Transport type to use (http or sse)",
+    help="Transport type to use (http, sse or ws)",
 )
 @click.option(
     "--url",
@@ -194,8 +626,9 @@ async def test(
     help="Enable verbose output",
 )
 def main(transport: str, url: str, verbose: bool):
-    """MCP Client supporting both SSE and HTTP transports."""
+    """MCP Client supporting SSE, HTTP and WebSocket transports."""
     if verbose:
+        logging.basicConfig(level=logging.DEBUG)
         print(f"🚀 Starting MCP Client")
         print(f"   Transport: {transport.upper()}")
         print(f"   Server URL: {url}")
@@ -203,7 +636,7 @@ def main(transport: str, url: str, verbose: bool):
     # client = SimpleClient("http://localhost:8080/mcp", "http")
     # asyncio.run(client.connect())
 
-    asyncio.run(test(url, transport.lower(), MCPAuth.bearer_token, token))
+    run(test(url, transport.lower(), MCPAuth.bearer_token, token))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,13 @@
-import asyncio
+from __future__ import annotations
+
 from mcp import ClientSession
 from mcp.types import Tool
 from mcp.client.sse import sse_client
 
 from litellm import experimental_mcp_client
 
+from mcp_runtime import run
+
 import os
 
 base_url: str = os.getenv("LITELLM_BASE_URL", "http://localhost:8080")
@@ -46,7 +49,7 @@ async def client_execute():
 
 
 def main():
-    asyncio.run(client_execute())
+    run(client_execute())
 
 
 if __name__ == "__main__":
@@ -1,201 +1,298 @@
+from __future__ import annotations
+
 import asyncio
-from typing import Optional
+import base64
 import click
+import functools
+import logging
+import traceback
+from contextlib import AsyncExitStack
 from datetime import timedelta
+import httpx
 from mcp import ClientSession
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamablehttp_client
 
-from mcp_types import MCPAuth, MCPTransport, MCPTransportType, MCPAuthType
+from mcp_types import (
+    MCP_BLOB_URI_PREFIX,
+    MCPAuth,
+    MCPTransport,
+    MCPTransportType,
+    MCPAuthType,
+)
+from mcp_runtime import SharedHTTPPool, run
+
+logger = logging.getLogger(__name__)
 
 # default dummy token
 token = "sk-1234"
 
 
+@functools.lru_cache(maxsize=256)
+def _build_auth_header(
+    auth_type: MCPAuthType, auth_passthrough: str
+) -> tuple[tuple[str, str], ...]:
+    """Header items for an auth value, cached per (auth_type, auth_passthrough)."""
+    if auth_type == MCPAuth.bearer_token:
+        return (("Authorization", f"Bearer {auth_passthrough}"),)
+    elif auth_type == MCPAuth.basic:
+        # Assuming auth_passthrough is in format "username:password"
+        auth_bytes = base64.b64encode(auth_passthrough.encode()).decode()
+        return (("Authorization", f"Basic {auth_bytes}"),)
+    elif auth_type == MCPAuth.api_key:
+        return (("X-API-Key", auth_passthrough),)
+    return ()
+
+
+# (tool name, arguments) run by the client test
+_TEST_CALLS = [
+    ("get_current_time", {"format": "short"}),
+    ("get_current_time", {"format": "long"}),
+    ("get_current_time", {"format": "iso"}),
+    ("echo", {"message": "Hello from MCP client!"}),
+    ("add_numbers", {"a": 15, "b": 27}),
+    ("check_auth", {"message": "Am I authenticated?"}),
+]
+
+
+# One connection pool shared by every MCPClient in the process, so clients for
+# the same host reuse its connections. Closed with aclose_shared_http().
+_http_pool = SharedHTTPPool(
+    httpx.Limits(max_connections=200, max_keepalive_connections=200), timeout=60.0
+)
+
+
+async def aclose_shared_http():
+    """Close the shared connection pool; the next connect opens a fresh one."""
+    await _http_pool.aclose()
+
+
 class MCPClient:
-    """MCP Client supporting both SSE and HTTP transports."""
+    """
+    MCP Client supporting both SSE and HTTP transports.
+      Use as an async context manager; the transport and initialized session
+      are opened once on enter and reused for every call until exit. All
+      clients share one connection pool, see aclose_shared_http().
+    """
+
+    __slots__ = (
+        "server_url",
+        "transport_type",
+        "session",
+        "auth_type",
+        "auth_passthrough",
+        "resolve_blobs",
+        "_stack",
+    )
 
     def __init__(
         self,
         server_url: str,
         transport_type: MCPTransportType = MCPTransport.http,
         auth_type: MCPAuthType = None,
+        auth_passthrough: str | None = None,
+        resolve_blobs: bool = False,
     ):
         self.server_url = server_url
         self.transport_type = transport_type
         self.session: ClientSession | None = None
         self.auth_type = auth_type
+        self.auth_passthrough = auth_passthrough
+        self.resolve_blobs = resolve_blobs
+        self._stack: AsyncExitStack | None = None
+
+    async def __aenter__(self):
+        """Open the transport and MCP session."""
+        logger.debug(
+            "🔗 Connecting to %s using %s transport...",
+            self.server_url,
+            self.transport_type.upper(),
+        )
+
+        async with AsyncExitStack() as stack:
+            headers = self._get_auth_headers(self.auth_passthrough)
+            if self.transport_type == MCPTransport.sse:
+                logger.debug("📡 Opening SSE transport connection...")
+                read_stream, write_stream = await stack.enter_async_context(
+                    sse_client(
+                        url=self.server_url,
+                        timeout=60,
+                        headers=headers,
+                        httpx_client_factory=_http_pool.client_factory,
+                    )
+                )
+                get_session_id = None
+            else:
+                logger.debug("📡 Opening StreamableHTTP transport connection...")
+                read_stream, write_stream, get_session_id = (
+                    await stack.enter_async_context(
+                        streamablehttp_client(
+                            url=self.server_url,
+                            timeout=timedelta(seconds=60),
+                            headers=headers,
+                            httpx_client_factory=_http_pool.client_factory,
+                        )
+                    )
+                )
 
-    def _get_auth_headers(self, auth_passthrough: Optional[str] = None) -> dict:
+            logger.debug("🤝 Initializing MCP session...")
+            session = await stack.enter_async_context(
+                ClientSession(read_stream, write_stream)
+            )
+            await session.initialize()
+            logger.debug("✅ Session initialization complete!")
+
+            if get_session_id:
+                session_id = get_session_id()
+                if session_id:
+                    logger.debug("Session ID: %s", session_id)
+
+            # keep everything open past this block; __aexit__ unwinds it
+            self._stack = stack.pop_all()
+
+        self.session = session
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the MCP session and transport."""
+        stack, self._stack = self._stack, None
+        self.session = None
+        await stack.__aexit__(exc_type, exc_val, exc_tb)
+
+    def _get_auth_headers(self, auth_passthrough: str | None = None) -> dict:
         """Generate authentication headers based on auth type."""
         if not auth_passthrough:
             return {}
 
-        if self.auth_type == MCPAuth.bearer_token:
-            return {"Authorization": f"Bearer {auth_passthrough}"}
-        elif self.auth_type == MCPAuth.basic_auth:
-            # Assuming auth_passthrough is in format "username:password"
-            import base64
-
-            auth_bytes = base64.b64encode(auth_passthrough.encode()).decode()
-            return {"Authorization": f"Basic {auth_bytes}"}
-        elif self.auth_type == MCPAuth.api_key:
-            return {"X-API-Key": auth_passthrough}
-        return {}
+        return dict(_build_auth_header(self.auth_type, auth_passthrough))
 
-    async def connect_and_test(self, auth_passthrough: Optional[str] = None):
+    async def connect_and_test(self, auth_passthrough: str | None = None):
         """Connect to the MCP server and test the get_current_time tool."""
-        print(
-            f"🔗 Connecting to {self.server_url} using {self.transport_type.upper()} transport..."
-        )
+        if self.session is not None:
+            # already inside `async with`, reuse the open session
+            await self._run_tests()
+            return
 
+        if auth_passthrough is not None:
+            self.auth_passthrough = auth_passthrough
         try:
-            if self.transport_type == MCPTransport.sse:
-                await self._connect_sse(auth_passthrough)
-            else:
-                await self._connect_http(auth_passthrough)
+            async with self:
+                await self._run_tests()
         except Exception as e:
-            print(f"❌ Failed to connect: {e}")
-            import traceback
-
+            logger.error("❌ Failed to connect: %s", e)
             traceback.print_exc()
 
-    async def _connect_sse(self, auth_passthrough: Optional[str] = None):
-        """Connect using SSE transport."""
-        print("📡 Opening SSE transport connection...")
-        headers = self._get_auth_headers(auth_passthrough)
-        async with sse_client(
-            url=self.server_url,
-            timeout=60,
-            headers=headers,
-        ) as (read_stream, write_stream):
-            await self._run_session(read_stream, write_stream)
-
-    async def _connect_http(self, auth_passthrough: Optional[str] = None):
-        """Connect using HTTP transport."""
-        print("📡 Opening StreamableHTTP transport connection...")
-        headers = self._get_auth_headers(auth_passthrough)
-        async with streamablehttp_client(
-            url=self.server_url,
-            timeout=timedelta(seconds=60),
-            headers=headers,
-        ) as (read_stream, write_stream, get_session_id):
-            await self._run_session(read_stream, write_stream, get_session_id)
-
-    async def _run_session(self, read_stream, write_stream, get_session_id=None):
-        """Run the MCP session with the given streams."""
-        print("🤝 Initializing MCP session...")
-        async with ClientSession(read_stream, write_stream) as session:
-            self.session = session
-            print("⚡ Starting session initialization...")
-            await session.initialize()
-            print("✅ Session initialization complete!")
-
-            if get_session_id:
-                session_id = get_session_id()
-                if session_id:
-                    print(f"Session ID: {session_id}")
-
-            # List available tools
-            await self._list_tools()
+    async def _run_tests(self):
+        """List the available tools and run the tool tests."""
+        # List available tools
+        await self._list_tools()
 
-            # Test the get_current_time tool
-            await self._test_get_current_time()
+        # Test the get_current_time tool
+        await self._test_get_current_time()
 
     async def _list_tools(self):
         """List available tools from the server."""
         if not self.session:
-            print("❌ Not connected to server")
+            logger.error("❌ Not connected to server")
             return
 
         try:
             result = await self.session.list_tools()
-            if hasattr(result, "tools") and result.tools:
-                print(f"\n📋 Available tools ({len(result.tools)}):")
-                for i, tool in enumerate(result.tools, 1):
-                    print(f"{i}. {tool.name}")
+            try:
+                tools = result.tools
+            except AttributeError:
+                tools = None
+            if tools:
+                logger.info("📋 Available tools (%d):", len(tools))
+                for i, tool in enumerate(tools, 1):
+                    logger.info("%d. %s", i, tool.name)
                     if tool.description:
-                        print(f"   Description: {tool.description}")
-                    print()
+                        logger.info("   Description: %s", tool.description)
             else:
-                print("No tools available")
+                logger.info("No tools available")
         except Exception as e:
-            print(f"❌ Failed to list tools: {e}")
+            logger.error("❌ Failed to list tools: %s", e)
+
+    async def resolve_blob(self, handle: str) -> str:
+        """Fetch the text behind a blob handle returned for a large tool result."""
+        result = await self.session.call_tool(
+            "get_blob", {"digest": handle.removeprefix(MCP_BLOB_URI_PREFIX)}
+        )
+        content = result.content[0] if result.content else None
+        if result.isError or content is None or content.type != "text":
+            detail = content.text if content and content.type == "text" else content
+            raise ValueError(f"Failed to resolve blob {handle}: {detail}")
+        return content.text
 
     async def _test_get_current_time(self):
-        """Test the get_current_time tool with different formats."""
+        """Test the get_current_time tool with different formats, plus the other tools."""
         if not self.session:
-            print("❌ Not connected to server")
+            logger.error("❌ Not connected to server")
             return
 
-        formats = ["short", "long", "iso"]
-
-        for format_type in formats:
-            try:
-                print(f"\n🔧 Testing get_current_time with format: {format_type}")
-                result = await self.session.call_tool(
-                    "get_current_time", {"format": format_type}
-                )
+        # issue every call at once; the session multiplexes them over one transport
+        results = await asyncio.gather(
+            *(
+                self.session.call_tool(name, arguments)
+                for name, arguments in _TEST_CALLS
+            ),
+            return_exceptions=True,
+        )
 
-                if hasattr(result, "content") and result.content:
-                    for content in result.content:
-                        if hasattr(content, "text"):
-                            print(f"   Result: {content.text}")
-                        else:
-                            print(f"   Result: {content}")
+        # skip walking the results entirely when nothing would be logged
+        verbose = logger.isEnabledFor(logging.INFO)
+        for (name, arguments), result in zip(_TEST_CALLS, results):
+            if isinstance(result, Exception):
+                logger.error("❌ Failed to call %s tool: %s", name, result)
+            elif verbose:
+                if name == "get_current_time":
+                    logger.info(
+                        "🔧 Testing get_current_time with format: %s",
+                        arguments["format"],
+                    )
                 else:
-                    print(f"   Result: {result}")
+                    logger.info("🔧 Testing %s tool", name)
+                await self._log_result(result)
 
-            except Exception as e:
-                print(
-                    f"❌ Failed to call get_current_time with format {format_type}: {e}"
-                )
-
-        # Test echo tool
-        try:
-            print(f"\n🔧 Testing echo tool")
-            result = await self.session.call_tool(
-                "echo", {"message": "Hello from MCP client!"}
-            )
-
-            if hasattr(result, "content") and result.content:
-                for content in result.content:
-                    if hasattr(content, "text"):
-                        print(f"   Result: {content.text}")
-                    else:
-                        print(f"   Result: {content}")
-        except Exception as e:
-            print(f"❌ Failed to call echo tool: {e}")
-
-        # Test add_numbers tool
+    async def _log_result(self, result):
+        """Log each content item of a tool result."""
         try:
-            print(f"\n🔧 Testing add_numbers tool")
-            result = await self.session.call_tool("add_numbers", {"a": 15, "b": 27})
-
-            if hasattr(result, "content") and result.content:
-                for content in result.content:
-                    if hasattr(content, "text"):
-                        print(f"   Result: {content.text}")
-                    else:
-                        print(f"   Result: {content}")
-        except Exception as e:
-            print(f"❌ Failed to call add_numbers tool: {e}")
-
-        # Test check_auth tool
-        try:
-            print(f"\n🔧 Testing check_auth tool")
-            result = await self.session.call_tool(
-                "check_auth", {"message": "Am I authenticated?"}
-            )
+            items = result.content
+        except AttributeError:
+            items = None
+        if not items:
+            logger.info("   Result: %s", result)
+            return
 
-            if hasattr(result, "content") and result.content:
-                for content in result.content:
-                    if hasattr(content, "text"):
-                        print(f"   Result: {content.text}")
-                    else:
-                        print(f"   Result: {content}")
-        except Exception as e:
-            print(f"❌ Failed to call add_numbers tool: {e}")
+        for content in items:
+            try:
+                text = content.text
+            except AttributeError:
+                logger.info("   Result: %s", content)
+                continue
+            if self.resolve_blobs and text.startswith(MCP_BLOB_URI_PREFIX):
+                try:
+                    text = await self.resolve_blob(text)
+                except ValueError as e:
+                    logger.error("❌ %s", e)
+                    continue
+            logger.info("   Result: %s", text)
+
+
+async def test(url: str, transport: MCPTransportType):
+    """Run the tool tests against the server over one session."""
+    try:
+        async with MCPClient(
+            url, transport, auth_type=MCPAuth.bearer_token, auth_passthrough=token
+        ) as client:
+            await client._list_tools()
+            await client._test_get_current_time()
+    except Exception as e:
+        logger.error("❌ Failed to connect: %s", e)
+        traceback.print_exc()
+    finally:
+        # closed on the loop that opened it, rather than from an atexit hook
+        await aclose_shared_http()
 
 
 @click.command()
@@ -220,15 +317,17 @@ class MCPClient:
 )
 def main(transport: str, url: str, verbose: bool):
     """MCP Client supporting both SSE and HTTP transports."""
+    # warnings and errors only by default; --verbose adds this client's results
+    # without turning on httpx's per-request logging
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
     if verbose:
-        print(f"🚀 Starting MCP Client")
-        print(f"   Transport: {transport.upper()}")
-        print(f"   Server URL: {url}")
-        print()
+        logger.setLevel(logging.INFO)
+    logger.info("🚀 Starting MCP Client")
+    logger.info("   Transport: %s", transport.upper())
+    logger.info("   Server URL: %s", url)
 
     # Create and run the client
-    client = MCPClient(url, transport.lower(), auth_type=MCPAuth.bearer_token)
-    asyncio.run(client.connect_and_test(token))
+    run(test(url, transport.lower()))
 
 
 if __name__ == "__main__":
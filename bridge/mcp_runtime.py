@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+import httpx
+
+__all__ = [
+    "SharedHTTPPool",
+    "run",
+]
+
+_T = TypeVar("_T")
+
+
+def run(main: Coroutine[Any, Any, _T]) -> _T:
+    """
+    Run a coroutine to completion on a fresh event loop.
+      Uses the libuv-backed loop (uvloop, or winloop on Windows) and falls back
+      to asyncio where neither is installed.
+    """
+    try:
+        from uvloop import run as loop_run
+    except ImportError:
+        try:
+            from winloop import run as loop_run
+        except ImportError:
+            from asyncio import run as loop_run
+    return loop_run(main)
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Delegates to a long-lived httpx transport and ignores close.
+      The MCP transports close their httpx client on exit; this keeps the
+      connection pool underneath alive for the next connect.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request over the long-lived transport."""
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+class SharedHTTPPool:
+    """
+    One httpx connection pool shared by every MCP transport built from it.
+      Pass client_factory as the transports' httpx_client_factory. The pool is
+      created on first use and closed with aclose(); the next connect after
+      that opens a fresh one.
+    """
+
+    __slots__ = ("limits", "timeout", "_transport")
+
+    def __init__(self, limits: httpx.Limits, timeout: float = 30.0):
+        self.limits = limits
+        # used when the MCP transport does not pass its own timeout
+        self.timeout = timeout
+        self._transport: httpx.AsyncHTTPTransport | None = None
+
+    def client_factory(
+        self,
+        headers: dict[str, str] | None = None,
+        timeout: httpx.Timeout | None = None,
+        auth: httpx.Auth | None = None,
+    ) -> httpx.AsyncClient:
+        """httpx client factory for the MCP transports, backed by the shared pool."""
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport(http2=True, limits=self.limits)
+        return httpx.AsyncClient(
+            transport=_SharedTransport(self._transport),
+            follow_redirects=True,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.Timeout(self.timeout),
+            auth=auth,
+        )
+
+    async def aclose(self):
+        """Close the shared connection pool."""
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            await transport.aclose()
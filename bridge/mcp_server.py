@@ -1,81 +1,179 @@
-import enum
-import json
 import asyncio
-from typing import Literal, Optional, TypedDict, Dict, Any
-
-from pydantic import BaseModel, ConfigDict
+import collections
 import contextlib
+import functools
+import hashlib
 import logging
+import orjson
+import os
+import time
 from collections.abc import AsyncIterator
 
 import mcp.types as types
 from mcp.server.lowlevel import Server
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.routing import Mount, Route
 from starlette.types import Receive, Scope, Send
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 import uvicorn
 
+from mcp_tools import get_current_time
+from mcp_types import MCP_BLOB_URI_PREFIX
+
 logger = logging.getLogger(__name__)
 
 # Create MCP server instance
 mcp_server = Server("mcp-fastapi-server", "1.0.0")
 
-
-@mcp_server.list_tools()
-async def list_tools() -> list[types.Tool]:
-    """List available tools."""
-    return [
-        types.Tool(
-            name="echo",
-            description="Echo back the provided message",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "message": {
-                        "type": "string",
-                        "description": "Message to echo back",
-                    }
-                },
-                "required": ["message"],
-            },
-        ),
-        types.Tool(
-            name="get_current_time",
-            description="Get the current time",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "format": {
-                        "type": "string",
-                        "description": "Format for the time (short, long, iso)",
-                        "enum": ["short", "long", "iso"],
-                        "default": "short",
-                    }
-                },
-            },
-        ),
-        types.Tool(
-            name="add_numbers",
-            description="Add two numbers together",
-            inputSchema={
+# Text content above this many bytes is stored server-side and returned as a
+# blob handle instead
+BLOB_THRESHOLD_BYTES = 16384
+
+
+class BlobStore:
+    """
+    In-memory store for large tool outputs, keyed by sha256 of the payload.
+      Least recently used blobs are evicted past max_blobs.
+    """
+
+    __slots__ = ("_blobs", "max_blobs")
+
+    def __init__(self, max_blobs: int = 256):
+        self._blobs: collections.OrderedDict[str, str] = collections.OrderedDict()
+        self.max_blobs = max_blobs
+
+    def put(self, payload: str) -> str:
+        """Store the payload and return its digest."""
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        self._blobs[digest] = payload
+        self._blobs.move_to_end(digest)
+        if len(self._blobs) > self.max_blobs:
+            self._blobs.popitem(last=False)
+        return digest
+
+    def get(self, digest: str) -> str | None:
+        """Fetch a payload by digest, or None if it was never stored or evicted."""
+        payload = self._blobs.get(digest)
+        if payload is not None:
+            self._blobs.move_to_end(digest)
+        return payload
+
+
+blob_store = BlobStore()
+
+# get_current_time formats whose text only changes on a fixed boundary, mapped
+# to that period in seconds. iso includes microseconds and is never cached.
+_TIME_CACHE_PERIODS = {"short": 60, "long": 1}
+
+# format -> (expires_at, content)
+_time_cache: dict[str, tuple[float, list[types.TextContent]]] = {}
+
+
+# Tool input schemas, authored here and never mutated
+_ECHO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "message": {
+            "type": "string",
+            "description": "Message to echo back",
+        }
+    },
+    "required": ["message"],
+}
+_GET_CURRENT_TIME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "format": {
+            "type": "string",
+            "description": "Format for the time (short, long, iso)",
+            "enum": ["short", "long", "iso"],
+            "default": "short",
+        }
+    },
+}
+_ADD_NUMBERS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "a": {
+            "type": "number",
+            "description": "First number",
+        },
+        "b": {
+            "type": "number",
+            "description": "Second number",
+        },
+    },
+    "required": ["a", "b"],
+}
+_CALL_TOOL_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "calls": {
+            "type": "array",
+            "description": "Tool calls to run, results are returned in order",
+            "items": {
                 "type": "object",
                 "properties": {
-                    "a": {
-                        "type": "number",
-                        "description": "First number",
-                    },
-                    "b": {
-                        "type": "number",
-                        "description": "Second number",
-                    },
+                    "name": {"type": "string"},
+                    "arguments": {"type": "object"},
                 },
-                "required": ["a", "b"],
+                "required": ["name"],
             },
-        ),
-    ]
+        }
+    },
+    "required": ["calls"],
+}
+_GET_BLOB_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "digest": {
+            "type": "string",
+            "description": "Digest following the blob handle prefix",
+        }
+    },
+    "required": ["digest"],
+}
+
+# Tool schemas are static, so build the models once at import rather than
+# per list_tools request. The catalog is known-good, so model_construct skips
+# pydantic validation
+_TOOLS: list[types.Tool] = [
+    types.Tool.model_construct(
+        name="echo",
+        description="Echo back the provided message",
+        inputSchema=_ECHO_SCHEMA,
+    ),
+    types.Tool.model_construct(
+        name="get_current_time",
+        description="Get the current time",
+        inputSchema=_GET_CURRENT_TIME_SCHEMA,
+    ),
+    types.Tool.model_construct(
+        name="add_numbers",
+        description="Add two numbers together",
+        inputSchema=_ADD_NUMBERS_SCHEMA,
+    ),
+    types.Tool.model_construct(
+        name="call_tool_batch",
+        description="Run several tool calls concurrently in one request",
+        inputSchema=_CALL_TOOL_BATCH_SCHEMA,
+    ),
+    types.Tool.model_construct(
+        name="get_blob",
+        description=f"Fetch a large tool result returned as a {MCP_BLOB_URI_PREFIX} handle",
+        inputSchema=_GET_BLOB_SCHEMA,
+    ),
+]
+
+
+@mcp_server.list_tools()
+async def list_tools() -> list[types.Tool]:
+    """List available tools."""
+    return _TOOLS
 
 
 @mcp_server.call_tool()
@@ -83,57 +181,151 @@ async def call_tool(
     name: str, arguments: dict
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     """Handle tool calls."""
+    if name == "get_blob":
+        return _get_blob(arguments.get("digest", ""))
+    if name == "call_tool_batch":
+        return _offload_large_content(
+            await _call_tool_batch(arguments.get("calls", []))
+        )
+    return _offload_large_content(await _run_tool(name, arguments))
 
-    if name == "echo":
-        message = arguments.get("message", "")
-        return [
-            types.TextContent(
-                type="text",
-                text=f"Echo: {message}",
-            )
-        ]
-
-    elif name == "get_current_time":
-        from datetime import datetime
-
-        format_type = arguments.get("format", "short")
-        current_time = datetime.now()
-
-        if format_type == "short":
-            time_str = current_time.strftime("%H:%M")
-        elif format_type == "long":
-            time_str = current_time.strftime("%Y-%m-%d %H:%M:%S")
-        elif format_type == "iso":
-            time_str = current_time.isoformat()
-        else:
-            time_str = current_time.strftime("%H:%M")
-
-        return [
-            types.TextContent(
-                type="text",
-                text=time_str,
-            )
-        ]
 
-    elif name == "add_numbers":
-        a = arguments.get("a", 0)
-        b = arguments.get("b", 0)
-        result = a + b
+# Tool text is always a str built here, so skip pydantic validation
+_text_content = functools.partial(types.TextContent.model_construct, type="text")
 
-        return [
-            types.TextContent(
-                type="text",
-                text=f"The sum of {a} and {b} is {result}",
-            )
-        ]
 
-    else:
+def _text_reply(text: str) -> list[types.TextContent]:
+    """Wrap text as a single-item tool result."""
+    return [_text_content(text=text)]
+
+
+def _get_blob(digest: str) -> list[types.TextContent]:
+    """Resolve a blob handle digest back to its stored text."""
+    payload = blob_store.get(digest.removeprefix(MCP_BLOB_URI_PREFIX))
+    if payload is None:
+        raise ValueError(f"Unknown blob: {digest}")
+    return _text_reply(payload)
+
+
+def _offload_large_content(
+    content: list[types.TextContent | types.ImageContent | types.EmbeddedResource],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Swap text content above the blob threshold for blob handles."""
+    offloaded = None
+    for i, item in enumerate(content):
+        if (
+            isinstance(item, types.TextContent)
+            and len(item.text.encode()) > BLOB_THRESHOLD_BYTES
+        ):
+            if offloaded is None:
+                # copy so cached result lists are never modified
+                offloaded = list(content)
+            digest = blob_store.put(item.text)
+            offloaded[i] = _text_content(text=MCP_BLOB_URI_PREFIX + digest)
+    return content if offloaded is None else offloaded
+
+
+async def _call_tool_batch(
+    calls: list[dict],
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Run a batch of tool calls concurrently, keeping their content in call order."""
+    results = await asyncio.gather(
+        *(_run_tool(call["name"], call.get("arguments") or {}) for call in calls),
+        return_exceptions=True,
+    )
+
+    content = []
+    for result in results:
+        if isinstance(result, Exception):
+            result = _text_reply(f"Error: {result}")
+        content.extend(result)
+    return content
+
+
+async def _run_tool(
+    name: str, arguments: dict
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Run a single tool."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
+    return handler(arguments)
+
+
+def _echo(arguments: dict) -> list[types.TextContent]:
+    """echo tool."""
+    return _text_reply("Echo: " + str(arguments.get("message", "")))
+
+
+def _get_current_time(arguments: dict) -> list[types.TextContent]:
+    """get_current_time tool, cached per format until its text changes."""
+    format_type = arguments.get("format", "short")
+    if not isinstance(format_type, str):
+        # unvalidated JSON; lists and objects are unknown formats, not cache keys
+        format_type = "short"
+    now = time.time()
+    period = _TIME_CACHE_PERIODS.get(format_type)
+    if period is not None:
+        cached = _time_cache.get(format_type)
+        if cached is not None and now < cached[0]:
+            return cached[1]
+
+    content = _text_reply(get_current_time(format_type, now))
+    if period is not None:
+        # Valid until the next minute/second boundary
+        _time_cache[format_type] = (now - now % period + period, content)
+    return content
+
+
+def _add(arguments: dict) -> list[types.TextContent]:
+    """add_numbers tool."""
+    a, b = arguments.get("a", 0), arguments.get("b", 0)
+    try:
+        return _add_numbers(a, b)
+    except TypeError:
+        # unhashable JSON values (lists, objects) bypass the cache
+        return _add_numbers.__wrapped__(a, b)
+
 
+_SUM_TEMPLATE = "The sum of %s and %s is %s"
 
-async def health_check(request: Request) -> JSONResponse:
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _add_numbers(a: float, b: float) -> list[types.TextContent]:
+    """add_numbers is pure, so its content is cached per (a, b)."""
+    return _text_reply(_SUM_TEMPLATE % (a, b, a + b))
+
+
+_HANDLERS = {
+    "echo": _echo,
+    "get_current_time": _get_current_time,
+    "add_numbers": _add,
+}
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+async def cache_stats(request: Request) -> ORJSONResponse:
+    """Tool result cache stats."""
+    return ORJSONResponse(
+        {
+            "add_numbers": _add_numbers.cache_info()._asdict(),
+            "get_current_time": {
+                format_type: expires_at
+                for format_type, (expires_at, _) in _time_cache.items()
+            },
+        }
+    )
+
+
+async def health_check(request: Request) -> ORJSONResponse:
     """Health check endpoint."""
-    return JSONResponse({"status": "healthy", "message": "MCP Server is running"})
+    return ORJSONResponse({"status": "healthy", "message": "MCP Server is running"})
 
 
 async def handle_mcp(scope: Scope, receive: Receive, send: Send) -> None:
@@ -160,7 +352,8 @@ async def lifespan(app: Starlette) -> AsyncIterator[None]:
                 logger.info("MCP Server shutting down...")
 
 
-# Create session managers
+# Create session managers. The response format is fixed per manager, so /mcp
+# and /sse each get their own rather than switching json_response per request.
 session_manager = StreamableHTTPSessionManager(
     app=mcp_server,
     event_store=None,
@@ -182,6 +375,7 @@ app = Starlette(
     debug=True,
     routes=[
         Route("/health", health_check, methods=["GET"]),
+        Route("/debug/cache", cache_stats, methods=["GET"]),
         # works in python's http transport and /mcp and /sse
         # works in and go's sse transport for /mcp and /sse
         Mount("/mcp", app=handle_mcp),
@@ -190,6 +384,9 @@ app = Starlette(
         # Route("/mcp", endpoint=handle_mcp, methods=["GET"]),
         # Route("/sse", endpoint=handle_sse, methods=["GET"]),
     ],
+    # Compresses JSON bodies for clients sending Accept-Encoding: gzip; SSE
+    # streams are left uncompressed by the middleware so events flush as sent
+    middleware=[Middleware(GZipMiddleware, minimum_size=512)],
     lifespan=lifespan,
 )
 
@@ -201,5 +398,22 @@ if __name__ == "__main__":
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
-    # Run the server
-    uvicorn.run(app, host="0.0.0.0", port=3000, log_level="info")
+    # Run the server on the C event loop / HTTP parser, keeping idle client
+    # connections open between tool calls. The app is passed as an import
+    # string so MCP_SERVER_WORKERS can opt into forking several workers. Only
+    # do that when get_blob is unused: the blob store, tool caches and
+    # /debug/cache stats are per process, and requests land on any worker.
+    # MCP_SERVER_LOOP takes any uvicorn loop name or a "module:factory" string,
+    # e.g. an io_uring-backed loop on Linux hosts that provide one. "auto" uses
+    # uvloop where it is installed and asyncio elsewhere (Windows).
+    uvicorn.run(
+        "mcp_server:app",
+        host="0.0.0.0",
+        port=3000,
+        log_level="info",
+        loop=os.getenv("MCP_SERVER_LOOP", "auto"),
+        http="httptools",
+        timeout_keep_alive=75,
+        backlog=2048,
+        workers=int(os.getenv("MCP_SERVER_WORKERS", "1")),
+    )
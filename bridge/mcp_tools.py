@@ -1,18 +1,42 @@
+import time
 from datetime import datetime
 
 
-def get_current_time(format: str = "short"):
+def _format_short(t: time.struct_time) -> str:
+    """HH:MM"""
+    return f"{t.tm_hour:02d}:{t.tm_min:02d}"
+
+
+def _format_long(t: time.struct_time) -> str:
+    """YYYY-MM-DD HH:MM:SS"""
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+        f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+    )
+
+
+# Built from the struct_time fields directly rather than via strftime's locale
+# machinery; iso is rendered by datetime instead
+_TIME_FORMATTERS = {"short": _format_short, "long": _format_long}
+
+
+def get_current_time(format: str = "short", now: float | None = None, **_ignored):
     """
     Simple handler for the 'get_current_time' tool.
 
     Args:
-        format (str): The format of the time to return ('short').
+        format (str): The format of the time to return ('short', 'long' or 'iso').
+        now (float | None): Timestamp to format, defaults to the current time.
 
     Returns:
-        str: The current time formatted as 'HH:MM'.
+        str: The time formatted as 'HH:MM', 'YYYY-MM-DD HH:MM:SS' or ISO 8601.
+          Unknown formats fall back to 'HH:MM'.
     """
-    # Get the current time
-    current_time = datetime.now()
+    if now is None:
+        now = time.time()
 
-    # Format the time as 'HH:MM'
-    return current_time.strftime("%H:%M")
+    if format == "iso":
+        return datetime.fromtimestamp(now).isoformat()
+    # non-str formats (e.g. from unvalidated JSON) cannot be dict keys
+    formatter = _TIME_FORMATTERS.get(format) if isinstance(format, str) else None
+    return (formatter or _format_short)(time.localtime(now))
@@ -1,12 +1,27 @@
+from __future__ import annotations
+
 import enum
-from typing import Literal, Optional, TypedDict
+from typing import Literal, TypedDict
 
 from pydantic import BaseModel, ConfigDict
 
+__all__ = [
+    "MCP_BLOB_URI_PREFIX",
+    "MCPAuth",
+    "MCPAuthType",
+    "MCPInfo",
+    "MCPServer",
+    "MCPSpecVersion",
+    "MCPSpecVersionType",
+    "MCPTransport",
+    "MCPTransportType",
+]
+
 
 class MCPTransport(str, enum.Enum):
     sse = "sse"
     http = "http"
+    ws = "ws"
 
 
 class MCPSpecVersion(str, enum.Enum):
@@ -22,17 +37,22 @@ class MCPAuth(str, enum.Enum):
 
 
 # MCP Literals
-MCPTransportType = Literal[MCPTransport.sse, MCPTransport.http]
+MCPTransportType = Literal[MCPTransport.sse, MCPTransport.http, MCPTransport.ws]
 MCPSpecVersionType = Literal[MCPSpecVersion.nov_2024, MCPSpecVersion.mar_2025]
-MCPAuthType = Optional[
-    Literal[MCPAuth.none, MCPAuth.api_key, MCPAuth.bearer_token, MCPAuth.basic]
-]
+MCPAuthType = (
+    Literal[MCPAuth.none, MCPAuth.api_key, MCPAuth.bearer_token, MCPAuth.basic] | None
+)
+
+
+# Tool results larger than the server's blob threshold are replaced with
+# "<prefix><sha256 digest>"; resolve them with the get_blob tool
+MCP_BLOB_URI_PREFIX = "mcp://blob/"
 
 
 class MCPInfo(TypedDict, total=False):
     server_name: str
-    description: Optional[str]
-    logo_url: Optional[str]
+    description: str | None
+    logo_url: str | None
 
 
 class MCPServer(BaseModel):
@@ -42,6 +62,6 @@ class MCPServer(BaseModel):
     # TODO: alter the types to be the Literal explicit
     transport: MCPTransportType
     spec_version: MCPSpecVersionType
-    auth_type: Optional[MCPAuthType] = None
-    mcp_info: Optional[MCPInfo] = None
+    auth_type: MCPAuthType | None = None
+    mcp_info: MCPInfo | None = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -3,8 +3,10 @@ from fastapi import FastAPI, Request, status, HTTPException, Depends, Header
 from fastapi.responses import StreamingResponse, Response
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import asyncio
 import json
+import orjson
 import uuid
 import os
 import time
@@ -31,12 +33,70 @@ load_dotenv()
 app = FastAPI()
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Explicit lists let the CORS middleware answer from precomputed headers instead
+# of echoing each request's headers back. Credentials stay off since the spec
+# forbids them alongside a "*" origin.
+CORS_ALLOW_METHODS = ("GET", "POST", "OPTIONS")
+CORS_ALLOW_HEADERS = ("Authorization", "Content-Type", "Accept", "X-API-Key")
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_credentials=False,
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,
+)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
+# Stop nginx-style proxies from buffering the event stream so each chunk is
+# flushed as it is yielded
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+# Non-streaming completion bodies are constant apart from the response id, so
+# they are serialized once and the id is spliced into the "%s" per request
+CHAT_COMPLETION_TEMPLATES = {
+    _model: orjson.dumps(
+        {
+            "id": "chatcmpl-%s",
+            "object": "chat.completion",
+            "created": 1677652288,
+            "model": _model,
+            "system_fingerprint": "fp_44709d6fcb",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": "\n\nHello there, how may I assist you today?",
+                    },
+                    "logprobs": None,
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 9, "completion_tokens": 12, "total_tokens": 21},
+        }
+    )
+    for _model in ("gpt-12", "gpt-3.5-turbo-0301")
+}
+
+TEXT_COMPLETION_TEMPLATE = orjson.dumps(
+    {
+        "id": "cmpl-$%s",
+        "choices": [
+            {
+                "finish_reason": "length",
+                "index": 0,
+                "logprobs": None,
+                "text": "\n\nA test request, how intriguing\nAn invitation for knowledge bringing\nWith words",
+            }
+        ],
+        "created": 1712420078,
+        "model": "unknown",
+        "object": "text_completion",
+        "system_fingerprint": None,
+        "usage": {"completion_tokens": 16, "prompt_tokens": 10, "total_tokens": 26},
+    }
 )
 
 
@@ -53,10 +113,7 @@ def data_generator():
             "model": "gpt-3.5-turbo-0125",
             "choices": [{"index": 0, "delta": {"content": word}}],
         }
-        try:
-            yield f"data: {json.dumps(chunk.dict())}\n\n"
-        except:
-            yield f"data: {json.dumps(chunk)}\n\n"
+        yield b"data: " + orjson.dumps(chunk) + b"\n\n"
 
 
 # for completion
@@ -87,34 +144,14 @@ async def completion(request: Request):
         return StreamingResponse(
             content=data_generator(),
             media_type="text/event-stream",
+            headers=SSE_HEADERS,
         )
     else:
-        _model = data.get("model")
-        if _model == "gpt-5":
-            _model = "gpt-12"
-        else:
-            _model = "gpt-3.5-turbo-0301"
-        response_id = uuid.uuid4().hex
-        response = {
-            "id": f"chatcmpl-{response_id}",
-            "object": "chat.completion",
-            "created": 1677652288,
-            "model": _model,
-            "system_fingerprint": "fp_44709d6fcb",
-            "choices": [
-                {
-                    "index": 0,
-                    "message": {
-                        "role": "assistant",
-                        "content": "\n\nHello there, how may I assist you today?",
-                    },
-                    "logprobs": None,
-                    "finish_reason": "stop",
-                }
-            ],
-            "usage": {"prompt_tokens": 9, "completion_tokens": 12, "total_tokens": 21},
-        }
-        return response
+        _model = "gpt-12" if data.get("model") == "gpt-5" else "gpt-3.5-turbo-0301"
+        return Response(
+            content=CHAT_COMPLETION_TEMPLATES[_model] % uuid.uuid4().hex.encode(),
+            media_type="application/json",
+        )
 
 
 # for completion
@@ -127,27 +164,13 @@ async def text_completion(request: Request):
         return StreamingResponse(
             content=data_generator(),
             media_type="text/event-stream",
+            headers=SSE_HEADERS,
         )
     else:
-        response_id = uuid.uuid4().hex
-        response = {
-            "id": f"cmpl-${response_id}",
-            "choices": [
-                {
-                    "finish_reason": "length",
-                    "index": 0,
-                    "logprobs": None,
-                    "text": "\n\nA test request, how intriguing\nAn invitation for knowledge bringing\nWith words",
-                }
-            ],
-            "created": 1712420078,
-            "model": "unknown",
-            "object": "text_completion",
-            "system_fingerprint": None,
-            "usage": {"completion_tokens": 16, "prompt_tokens": 10, "total_tokens": 26},
-        }
-
-        return response
+        return Response(
+            content=TEXT_COMPLETION_TEMPLATE % uuid.uuid4().hex.encode(),
+            media_type="application/json",
+        )
 
 
 # for completion
@@ -772,10 +795,7 @@ def data_generator_anthropic():
             "model": "gpt-3.5-turbo-0125",
             "choices": [{"index": 0, "delta": {"content": word}}],
         }
-        try:
-            yield f"data: {json.dumps(chunk.dict())}\n\n"
-        except:
-            yield f"data: {json.dumps(chunk)}\n\n"
+        yield b"data: " + orjson.dumps(chunk) + b"\n\n"
 
 
 # for completion
@@ -787,6 +807,7 @@ async def completion_anthropic(request: Request):
         return StreamingResponse(
             content=data_generator_anthropic(),
             media_type="text/event-stream",
+            headers=SSE_HEADERS,
         )
     else:
         response = {
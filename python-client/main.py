@@ -1,11 +1,35 @@
 from datetime import timedelta
 import os
 import asyncio
+import contextlib
+import sys
+import traceback
+from pathlib import Path
 from typing import Any
+import httpx
+import orjson
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 from mcp.client.sse import sse_client
 
+# event loop and connection pool helpers shared with the bridge clients
+sys.path.append(str(Path(__file__).resolve().parent.parent / "bridge"))
+from mcp_runtime import SharedHTTPPool, run  # noqa: E402
+
+try:
+    # line editing and history for input(); not available on Windows
+    import readline  # noqa: F401
+except ImportError:
+    pass
+
+_CONNECT_TIMEOUT = timedelta(seconds=60)
+
+# Connection pool shared by every SimpleClient connect, created on first use
+# and closed when main() exits
+_http_pool = SharedHTTPPool(
+    httpx.Limits(max_keepalive_connections=5, max_connections=10)
+)
+
 
 # https://github.com/modelcontextprotocol/python-sdk/blob/main/examples/clients/simple-auth-client/mcp_simple_auth_client/main.py
 class SimpleClient:
@@ -15,6 +39,10 @@ class SimpleClient:
         self.server_url = server_url
         self.transport_type = transport_type
         self.session: ClientSession | None = None
+        self._tools_task: asyncio.Task | None = None
+        # raw "call ..." command -> (tool_name, arguments), so repeated
+        # commands skip tokenizing and JSON parsing
+        self._call_cache: dict[str, tuple[str, dict[str, Any]]] = {}
 
     async def connect(self):
         """Connect to the MCP server."""
@@ -26,21 +54,21 @@ class SimpleClient:
                 print("📡 Opening SSE transport connection with auth...")
                 async with sse_client(
                     url=self.server_url,
-                    timeout=60,
+                    timeout=_CONNECT_TIMEOUT.total_seconds(),
+                    httpx_client_factory=_http_pool.client_factory,
                 ) as (read_stream, write_stream):
                     await self._run_session(read_stream, write_stream, None)
             else:
                 print("📡 Opening StreamableHTTP transport connection with auth...")
                 async with streamablehttp_client(
                     url=self.server_url,
-                    timeout=timedelta(seconds=60),
+                    timeout=_CONNECT_TIMEOUT,
+                    httpx_client_factory=_http_pool.client_factory,
                 ) as (read_stream, write_stream, get_session_id):
                     await self._run_session(read_stream, write_stream, get_session_id)
 
         except Exception as e:
             print(f"❌ Failed to connect: {e}")
-            import traceback
-
             traceback.print_exc()
 
     async def _run_session(self, read_stream, write_stream, get_session_id):
@@ -52,6 +80,9 @@ class SimpleClient:
             await session.initialize()
             print("✨ Session initialization complete!")
 
+            # prefetch the tool list while the prompt waits for the first command
+            self._tools_task = asyncio.create_task(session.list_tools())
+
             print(f"\n✅ Connected to MCP server at {self.server_url}")
             if get_session_id:
                 session_id = get_session_id()
@@ -59,7 +90,16 @@ class SimpleClient:
                     print(f"Session ID: {session_id}")
 
             # Run interactive loop
-            await self.interactive_loop()
+            try:
+                await self.interactive_loop()
+            finally:
+                task, self._tools_task = self._tools_task, None
+                if task is not None:
+                    task.cancel()
+                    # retrieve the outcome so a failed prefetch is not reported
+                    # as "Task exception was never retrieved"
+                    with contextlib.suppress(asyncio.CancelledError, Exception):
+                        await task
 
     async def list_tools(self):
         """List available tools from the server."""
@@ -68,7 +108,12 @@ class SimpleClient:
             return
 
         try:
-            result = await self.session.list_tools()
+            # the first list is answered by the prefetch
+            task, self._tools_task = self._tools_task, None
+            if task is not None:
+                result = await task
+            else:
+                result = await self.session.list_tools()
             if hasattr(result, "tools") and result.tools:
                 print("\n📋 Available tools:")
                 for i, tool in enumerate(result.tools, 1):
@@ -112,7 +157,9 @@ class SimpleClient:
 
         while True:
             try:
-                command = input("mcp> ").strip()
+                # read in a worker thread so the session keeps servicing its
+                # streams while waiting on the user
+                command = (await asyncio.to_thread(input, "mcp> ")).strip()
 
                 if not command:
                     continue
@@ -124,25 +171,27 @@ class SimpleClient:
                     await self.list_tools()
 
                 elif command.startswith("call "):
-                    parts = command.split(maxsplit=2)
-                    tool_name = parts[1] if len(parts) > 1 else ""
-
-                    if not tool_name:
-                        print("❌ Please specify a tool name")
-                        continue
-
-                    # Parse arguments (simple JSON-like format)
-                    arguments = {}
-                    if len(parts) > 2:
-                        import json
-
-                        try:
-                            arguments = json.loads(parts[2])
-                        except json.JSONDecodeError:
-                            print("❌ Invalid arguments format (expected JSON)")
+                    parsed = self._call_cache.get(command)
+                    if parsed is None:
+                        parts = command.split(maxsplit=2)
+                        tool_name = parts[1] if len(parts) > 1 else ""
+
+                        if not tool_name:
+                            print("❌ Please specify a tool name")
                             continue
 
-                    await self.call_tool(tool_name, arguments)
+                        # Parse arguments (simple JSON-like format)
+                        arguments = {}
+                        if len(parts) > 2:
+                            try:
+                                arguments = orjson.loads(parts[2])
+                            except orjson.JSONDecodeError:
+                                print("❌ Invalid arguments format (expected JSON)")
+                                continue
+
+                        parsed = self._call_cache[command] = (tool_name, arguments)
+
+                    await self.call_tool(*parsed)
 
                 else:
                     print(
@@ -159,14 +208,17 @@ class SimpleClient:
 async def main():
     # await clinet_call()
     # Start connection flow - OAuth will be handled automatically
-    go_url = "http://localhost:8080/sse"
-    client = SimpleClient(go_url, "sse")
-    await client.connect()
+    try:
+        go_url = "http://localhost:8080/sse"
+        client = SimpleClient(go_url, "sse")
+        await client.connect()
 
-    python_url = "http://localhost:3000/mcp"
-    client = SimpleClient(python_url, "http")
-    await client.connect()
+        python_url = "http://localhost:3000/mcp"
+        client = SimpleClient(python_url, "http")
+        await client.connect()
+    finally:
+        await _http_pool.aclose()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,5 +1,6 @@
 import contextlib
 import logging
+import os
 from collections.abc import AsyncIterator
 
 import anyio
@@ -13,6 +14,37 @@ from starlette.types import Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
+# Tool schemas are static, so build the models once at import rather than
+# per list_tools request
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="start-notification-stream",
+        description=(
+            "Sends a stream of notifications with configurable count and interval"
+        ),
+        inputSchema={
+            "type": "object",
+            "required": ["interval", "count", "caller"],
+            "properties": {
+                "interval": {
+                    "type": "number",
+                    "description": "Interval between notifications in seconds",
+                },
+                "count": {
+                    "type": "number",
+                    "description": "Number of notifications to send",
+                },
+                "caller": {
+                    "type": "string",
+                    "description": (
+                        "Identifier of the caller to include in notifications"
+                    ),
+                },
+            },
+        },
+    )
+]
+
 
 @click.command()
 @click.option("--port", default=3000, help="Port to listen on for HTTP")
@@ -72,35 +104,7 @@ def main(
 
     @app.list_tools()
     async def list_tools() -> list[types.Tool]:
-        return [
-            types.Tool(
-                name="start-notification-stream",
-                description=(
-                    "Sends a stream of notifications with configurable count"
-                    " and interval"
-                ),
-                inputSchema={
-                    "type": "object",
-                    "required": ["interval", "count", "caller"],
-                    "properties": {
-                        "interval": {
-                            "type": "number",
-                            "description": "Interval between notifications in seconds",
-                        },
-                        "count": {
-                            "type": "number",
-                            "description": "Number of notifications to send",
-                        },
-                        "caller": {
-                            "type": "string",
-                            "description": (
-                                "Identifier of the caller to include in notifications"
-                            ),
-                        },
-                    },
-                },
-            )
-        ]
+        return _TOOLS
 
     # Create the session manager with true stateless mode
     session_manager = StreamableHTTPSessionManager(
@@ -136,7 +140,17 @@ def main(
 
     import uvicorn
 
-    uvicorn.run(starlette_app, host="127.0.0.1", port=port)
+    # "auto" uses uvloop where it is installed and asyncio elsewhere (Windows);
+    # MCP_SERVER_LOOP also takes a uvicorn loop name or "module:factory" string
+    uvicorn.run(
+        starlette_app,
+        host="127.0.0.1",
+        port=port,
+        loop=os.getenv("MCP_SERVER_LOOP", "auto"),
+        http="httptools",
+        timeout_keep_alive=75,
+        backlog=2048,
+    )
 
     return 0
 